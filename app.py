@@ -4,13 +4,43 @@
 import mysql.connector
 import functools
 import os
+import csv
+import io
+import json
+import re
+import gzip
+import hashlib
+import mimetypes
+import threading
+import multiprocessing
+from datetime import date
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import click
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from flask import (
     Flask, request, redirect, url_for, 
-    render_template, session, g, abort, flash
+    render_template, session, g, abort, flash, jsonify, send_from_directory, send_file
 )
 from flask_bcrypt import Bcrypt
 from werkzeug.utils import secure_filename
 
+try:
+    import brotli  # Pinned in requirements.txt; the guard only drops the .br variants if missing
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image  # Pinned in requirements.txt; without it thumbnails are disabled
+except ImportError:
+    Image = None
+
+try:
+    import fitz  # PyMuPDF, pinned in requirements.txt; without it PDFs get no preview
+except ImportError:
+    fitz = None
+
 # ==========================================
 # 2. CONFIGURATION & APP INITIALIZATION
 # ==========================================
@@ -24,6 +54,26 @@ UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'zip', 'blend', 'fig', 'py', 'css'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Asset previews, generated into a "thumbnails" folder next to the originals.
+# Only the types the installed imaging libraries can actually render are previewed.
+THUMBNAIL_FOLDER = 'thumbnails'
+THUMBNAIL_TYPES = set()
+if Image is not None:
+    THUMBNAIL_TYPES = {'png', 'jpg', 'jpeg', 'gif'}
+    if fitz is not None:
+        THUMBNAIL_TYPES.add('pdf')
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', '2'))
+THUMBNAIL_TIMEOUT = 15  # seconds an on-demand request waits for a preview
+app.jinja_env.globals['thumbnail_types'] = THUMBNAIL_TYPES
+
+# Fingerprinted static bundles produced by `flask build-assets`
+ASSET_SOURCE_DIRS = ('css', 'js')
+ASSET_DIST_FOLDER = os.path.join(app.static_folder, 'dist')
+ASSET_MANIFEST = os.path.join(ASSET_DIST_FOLDER, 'manifest.json')
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+FINGERPRINTED_ASSET = re.compile(r'^(css|js)/[\w.-]+\.[0-9a-f]{12}\.(css|js)$')
+
 # Database Credentials
 from dotenv import load_dotenv
 load_dotenv()
@@ -54,11 +104,125 @@ def get_db_connection():
         print(f"Error connecting to MySQL: {err}")
         return None
 
+# Helpers for mapping cursor rows to lightweight records
+@functools.lru_cache(maxsize=256)
+def record_type(column_names):
+    """Builds (once per query shape) a slotted namedtuple class for the given columns.
+
+    Duplicate or non-identifier column names raise ValueError rather than being
+    renamed, so alias such columns explicitly in the query.
+    """
+    return namedtuple('Record', column_names)
+
+def fetch_all(cursor):
+    """Returns the remaining rows as records supporting attribute access (row.title)."""
+    make_record = record_type(tuple(cursor.column_names))._make
+    return list(map(make_record, cursor.fetchall()))
+
+def fetch_one(cursor):
+    """Returns the next row as a record, or None when there are no more rows."""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return record_type(tuple(cursor.column_names))._make(row)
+
 # Helper function for file uploads
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Helper functions for asset thumbnails
+def thumbnail_path(storage_location):
+    # Uploads are saved flat in UPLOAD_FOLDER, so a user file can never land in this subfolder
+    folder, name = os.path.split(storage_location)
+    return os.path.join(folder, THUMBNAIL_FOLDER, name + '.jpg')
+
+def thumbnail_is_fresh(storage_location):
+    """True when a thumbnail exists and is not older than its (possibly re-uploaded) original."""
+    target = thumbnail_path(storage_location)
+    try:
+        return os.path.getmtime(target) >= os.path.getmtime(storage_location)
+    except OSError:
+        return False
+
+def generate_thumbnail(storage_location, file_type):
+    """Renders a JPEG preview of an uploaded asset. Runs inside the worker pool.
+
+    Returns the thumbnail path, or None when the file type cannot be previewed.
+    """
+    if file_type not in THUMBNAIL_TYPES:
+        return None
+
+    target = thumbnail_path(storage_location)
+    if thumbnail_is_fresh(storage_location):
+        return target
+
+    if file_type == 'pdf':
+        with fitz.open(storage_location) as document:
+            pixmap = document[0].get_pixmap()
+            image = Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+        image.thumbnail(THUMBNAIL_SIZE)
+    else:
+        with Image.open(storage_location) as source:
+            source.draft('RGB', THUMBNAIL_SIZE)  # Lets JPEG decode at a reduced scale
+            source.thumbnail(THUMBNAIL_SIZE)
+            image = source.copy()
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    else:
+        image = image.convert('RGB')
+
+    # Write to a temporary file first so readers never see a partial thumbnail
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_path = f"{target}.{os.getpid()}.tmp"
+    image.save(temp_path, 'JPEG', quality=80, optimize=True)
+    os.replace(temp_path, target)
+    return target
+
+thumbnail_pool = None
+thumbnail_pool_lock = threading.Lock()
+
+def submit_thumbnail(storage_location, file_type):
+    """Submits a thumbnail job, creating the worker pool on first use.
+
+    A worker that dies (e.g. OOM-killed on a huge image) breaks the whole pool,
+    so a broken pool is replaced instead of failing every later job.
+    """
+    global thumbnail_pool
+    with thumbnail_pool_lock:
+        for attempt in range(2):
+            if thumbnail_pool is None:
+                # spawn avoids forking a threaded server process holding MySQL connections
+                thumbnail_pool = ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            try:
+                return thumbnail_pool.submit(generate_thumbnail, storage_location, file_type)
+            except BrokenProcessPool:
+                thumbnail_pool.shutdown(wait=False)
+                thumbnail_pool = None
+                if attempt:
+                    raise
+
+def log_thumbnail_error(future):
+    if future.exception() is not None:
+        print(f"Thumbnail Generation Error: {future.exception()}")
+
+def queue_thumbnails(uploaded_assets):
+    """Schedules background previews for (storage_location, file_type) pairs.
+
+    Called after the upload is committed, so failures are only logged.
+    """
+    for storage_location, file_type in uploaded_assets:
+        if file_type in THUMBNAIL_TYPES:
+            try:
+                submit_thumbnail(storage_location, file_type).add_done_callback(log_thumbnail_error)
+            except Exception as err:
+                print(f"Thumbnail Queue Error: {err}")
+
 # ==========================================
 # 4. SECURITY & AUTH DECORATORS
 # ==========================================
@@ -66,6 +230,11 @@ def allowed_file(filename):
 @app.before_request
 def load_logged_in_user():
     """Checks session for user_id and loads user data into 'g' object."""
+    # Static bundles need no user, and touching the session would add Vary: Cookie
+    if request.endpoint in ('static', 'dist_asset'):
+        g.user = None
+        return
+
     user_id = session.get('user_id')
 
     if user_id is None:
@@ -73,10 +242,10 @@ def load_logged_in_user():
     else:
         conn = get_db_connection()
         if conn:
-            cursor = conn.cursor(dictionary=True)
+            cursor = conn.cursor()
             query = "SELECT user_id, first_name, last_name, email, role FROM user WHERE user_id = %s"
             cursor.execute(query, (user_id,))
-            g.user = cursor.fetchone()
+            g.user = fetch_one(cursor)
             cursor.close()
             conn.close()
         else:
@@ -152,10 +321,10 @@ def login():
         return render_template('login.html', error=error)
     
     try:
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         query = "SELECT user_id, password_hash FROM user WHERE email = %s"
         cursor.execute(query, (email,))
-        user_record = cursor.fetchone() 
+        user_record = fetch_one(cursor) 
         
     except mysql.connector.Error as err:
         print(f"Login Query Error: {err}")
@@ -167,9 +336,9 @@ def login():
             cursor.close()
         conn.close()
 
-    if user_record and bcrypt.check_password_hash(user_record['password_hash'], password_attempt):
+    if user_record and bcrypt.check_password_hash(user_record.password_hash, password_attempt):
         session.clear()
-        session['user_id'] = user_record['user_id']
+        session['user_id'] = user_record.user_id
         return redirect(url_for('dashboard'))
     else:
         error = 'Invalid email or password.'
@@ -212,11 +381,12 @@ def add_project():
         else:
             status = status_from_form
 
-        user_id = g.user['user_id'] 
+        user_id = g.user.user_id 
         selected_skills = request.form.getlist('skills')
         selected_tags = request.form.getlist('tags')
 
         cursor = conn.cursor()
+        uploaded_assets = []
 
         try:
             project_insert_query = """
@@ -249,6 +419,7 @@ def add_project():
                         file_type = filename.rsplit('.', 1)[1].lower()
                         storage_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
                         cursor.execute(asset_query, (new_project_id, filename, file_type, storage_path))
+                        uploaded_assets.append((storage_path, file_type))
 
             # --- Handle Initial Feedback ---
             feedback_rating = request.form.get('feedback_rating')
@@ -261,6 +432,7 @@ def add_project():
                 cursor.execute(feedback_query, (new_project_id, user_id, feedback_rating, feedback_comment))
 
             conn.commit()
+            queue_thumbnails(uploaded_assets)
             flash('Project added successfully!', 'success')
             return redirect(url_for('dashboard'))
 
@@ -282,17 +454,17 @@ def add_project():
             flash("Database connection failed.", "danger")
             return redirect(url_for('dashboard'))
             
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
     
     try:
         cursor.execute("SELECT client_id, client_name FROM client")
-        clients = cursor.fetchall()
+        clients = fetch_all(cursor)
         
         cursor.execute("SELECT skill_id, skill_name FROM skill")
-        skills = cursor.fetchall()
+        skills = fetch_all(cursor)
 
         cursor.execute("SELECT tag_id, tag_name FROM tag")
-        tags = cursor.fetchall()
+        tags = fetch_all(cursor)
         
         return render_template('add_project.html', clients=clients, skills=skills, tags=tags)
     
@@ -316,17 +488,17 @@ def edit_project(project_id):
         flash("Database connection failed.", "danger")
         return redirect(url_for('projects_list'))
     
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
 
     # Initial checks
-    cursor.execute("SELECT project_id FROM project_user WHERE project_id = %s AND user_id = %s", (project_id, g.user['user_id']))
+    cursor.execute("SELECT project_id FROM project_user WHERE project_id = %s AND user_id = %s", (project_id, g.user.user_id))
     if cursor.fetchone() is None:
         cursor.close()
         conn.close()
         abort(403)
 
-    cursor.execute("SELECT * FROM project WHERE project_id = %s", (project_id,))
-    project = cursor.fetchone()
+    cursor.execute("SELECT project_id, title, completion_date FROM project WHERE project_id = %s", (project_id,))
+    project = fetch_one(cursor)
     if not project:
         cursor.close()
         conn.close()
@@ -334,6 +506,7 @@ def edit_project(project_id):
         return redirect(url_for('projects_list'))
 
     if request.method == 'POST':
+        uploaded_assets = []
         try:
             if 'asset_files' in request.files:
                 files = request.files.getlist('asset_files')
@@ -349,6 +522,7 @@ def edit_project(project_id):
                         file_type = filename.rsplit('.', 1)[1].lower()
                         storage_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
                         cursor.execute(asset_query, (project_id, filename, file_type, storage_path))
+                        uploaded_assets.append((storage_path, file_type))
 
             feedback_rating = request.form.get('feedback_rating')
             feedback_comment = request.form.get('feedback_comment')
@@ -357,7 +531,7 @@ def edit_project(project_id):
                     INSERT INTO feedback (project_id, user_id, rating, coment, date)
                     VALUES (%s, %s, %s, %s, CURDATE())
                 """
-                cursor.execute(feedback_query, (project_id, g.user['user_id'], feedback_rating, feedback_comment))
+                cursor.execute(feedback_query, (project_id, g.user.user_id, feedback_rating, feedback_comment))
             
             # FIX: Update completion date and status together
             new_completion_date = request.form.get('completion_date')
@@ -371,6 +545,7 @@ def edit_project(project_id):
             cursor.execute("UPDATE project SET completion_date = %s, status = %s WHERE project_id = %s", (date_to_update, new_status, project_id))
 
             conn.commit()
+            queue_thumbnails(uploaded_assets)
             flash('Project updated successfully!', 'success')
             return redirect(url_for('project_detail', project_id=project_id))
 
@@ -392,15 +567,15 @@ def edit_project(project_id):
             flash("Database connection failed.", "danger")
             return redirect(url_for('projects_list'))
             
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
     
     try:
-        cursor.execute("SELECT * FROM asset WHERE project_id = %s ORDER BY date_uploaded DESC", (project_id,))
-        assets = cursor.fetchall()
-        cursor.execute("SELECT f.*, u.first_name FROM feedback f JOIN user u ON f.user_id = u.user_id WHERE f.project_id = %s ORDER BY f.date DESC", (project_id,))
-        feedback = cursor.fetchall()
+        cursor.execute("SELECT asset_id, file_name, file_type, file_size_KB, date_uploaded FROM asset WHERE project_id = %s ORDER BY date_uploaded DESC", (project_id,))
+        assets = fetch_all(cursor)
+        cursor.execute("SELECT f.rating, f.coment, f.date, u.first_name FROM feedback f JOIN user u ON f.user_id = u.user_id WHERE f.project_id = %s ORDER BY f.date DESC", (project_id,))
+        feedback = fetch_all(cursor)
         cursor.execute("SELECT client_id, client_name FROM client")
-        clients = cursor.fetchall()
+        clients = fetch_all(cursor)
         
         return render_template('edit_project.html', project=project, assets=assets, feedback=feedback, clients=clients)
 
@@ -425,16 +600,16 @@ def dashboard():
     if conn is None:
         return render_template('dashboard.html', error="Database connection failed.") 
 
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
 
     try:
-        cursor.execute("SELECT COUNT(*) AS total_projects FROM project p JOIN project_user pu ON p.project_id = pu.project_id WHERE pu.user_id = %s", (g.user['user_id'],))
-        total_projects_result = cursor.fetchone()
-        dashboard_data['total_projects_count'] = total_projects_result['total_projects']
+        cursor.execute("SELECT COUNT(*) AS total_projects FROM project p JOIN project_user pu ON p.project_id = pu.project_id WHERE pu.user_id = %s", (g.user.user_id,))
+        total_projects_result = fetch_one(cursor)
+        dashboard_data['total_projects_count'] = total_projects_result.total_projects
 
-        cursor.execute("SELECT COUNT(*) AS completed_projects FROM project p JOIN project_user pu ON p.project_id = pu.project_id WHERE pu.user_id = %s AND p.status = 1", (g.user['user_id'],))
-        completed_projects_result = cursor.fetchone()
-        dashboard_data['completed_projects_count'] = completed_projects_result['completed_projects']
+        cursor.execute("SELECT COUNT(*) AS completed_projects FROM project p JOIN project_user pu ON p.project_id = pu.project_id WHERE pu.user_id = %s AND p.status = 1", (g.user.user_id,))
+        completed_projects_result = fetch_one(cursor)
+        dashboard_data['completed_projects_count'] = completed_projects_result.completed_projects
         
         q1_query = """
             SELECT c.client_name AS Client, c.industry AS Industry, SUM(p.total_hours_spent) AS Total_Hours_Across_Projects, COUNT(p.project_id) AS Number_of_Projects
@@ -443,8 +618,8 @@ def dashboard():
             WHERE pu.user_id = %s
             GROUP BY c.client_name, c.industry ORDER BY Total_Hours_Across_Projects DESC
         """
-        cursor.execute(q1_query, (g.user['user_id'],))
-        dashboard_data['client_summary'] = cursor.fetchall()
+        cursor.execute(q1_query, (g.user.user_id,))
+        dashboard_data['client_summary'] = fetch_all(cursor)
 
         q3_query = """
             SELECT s.skill_name AS Skill, COUNT(ps.project_id) AS Projects_Used_In
@@ -453,8 +628,8 @@ def dashboard():
             WHERE pu.user_id = %s
             GROUP BY s.skill_name HAVING COUNT(ps.project_id) > 0 ORDER BY Projects_Used_In DESC
         """
-        cursor.execute(q3_query, (g.user['user_id'],))
-        dashboard_data['top_skills'] = cursor.fetchall()
+        cursor.execute(q3_query, (g.user.user_id,))
+        dashboard_data['top_skills'] = fetch_all(cursor)
 
         q5_query = """
             SELECT p.project_id, p.title AS Project_Title, COUNT(a.asset_id) AS Number_of_Assets, SUM(a.file_size_KB) AS Total_Size_KB
@@ -463,8 +638,8 @@ def dashboard():
             WHERE p.status = 0 AND pu.user_id = %s
             GROUP BY p.project_id, p.title
         """
-        cursor.execute(q5_query, (g.user['user_id'],))
-        dashboard_data['in_progress_assets'] = cursor.fetchall()
+        cursor.execute(q5_query, (g.user.user_id,))
+        dashboard_data['in_progress_assets'] = fetch_all(cursor)
 
         q7_query = """
             SELECT s.skill_name AS Skill, AVG(ps.skill_proficiency_rating) AS Average_Proficiency_Rating
@@ -473,8 +648,8 @@ def dashboard():
             WHERE pu.user_id = %s
             GROUP BY s.skill_name ORDER BY Average_Proficiency_Rating DESC
         """
-        cursor.execute(q7_query, (g.user['user_id'],))
-        dashboard_data['skill_proficiency'] = cursor.fetchall()
+        cursor.execute(q7_query, (g.user.user_id,))
+        dashboard_data['skill_proficiency'] = fetch_all(cursor)
 
         q8_query = """
             SELECT CONCAT(u.first_name, ' ', u.last_name) AS Reviewer, u.role AS Role, COUNT(f.feedback_id) AS Total_Feedback_Given
@@ -484,8 +659,8 @@ def dashboard():
             WHERE pu.user_id = %s
             GROUP BY u.user_id, Reviewer, u.role ORDER BY Total_Feedback_Given DESC LIMIT 1
         """
-        cursor.execute(q8_query, (g.user['user_id'],))
-        dashboard_data['top_reviewer'] = cursor.fetchone()
+        cursor.execute(q8_query, (g.user.user_id,))
+        dashboard_data['top_reviewer'] = fetch_one(cursor)
 
         q10_query = """
             SELECT p.project_id, p.title AS Project_Title, c.client_name AS Client_Name, p.completion_date, p.total_hours_spent AS Total_Effort_Hours
@@ -494,8 +669,8 @@ def dashboard():
             WHERE pu.user_id = %s AND p.total_hours_spent IS NOT NULL
             ORDER BY p.total_hours_spent DESC LIMIT 5
         """
-        cursor.execute(q10_query, (g.user['user_id'],))
-        dashboard_data['top_projects'] = cursor.fetchall()
+        cursor.execute(q10_query, (g.user.user_id,))
+        dashboard_data['top_projects'] = fetch_all(cursor)
 
         q11_query = """
             SELECT u.role AS Team_Role, SUM(tl.hours_worked) AS Total_Hours_Logged_By_Role
@@ -503,8 +678,8 @@ def dashboard():
             WHERE u.user_id = %s
             GROUP BY u.role ORDER BY Total_Hours_Logged_By_Role DESC
         """
-        cursor.execute(q11_query, (g.user['user_id'],))
-        dashboard_data['role_workload'] = cursor.fetchall()
+        cursor.execute(q11_query, (g.user.user_id,))
+        dashboard_data['role_workload'] = fetch_all(cursor)
 
         q13_query = """
             SELECT a.file_type AS File_Extension, COUNT(a.asset_id) AS Count_of_Files, SUM(a.file_size_KB) AS Total_Size_KB
@@ -513,8 +688,8 @@ def dashboard():
             WHERE pu.user_id = %s
             GROUP BY a.file_type ORDER BY Count_of_Files DESC
         """
-        cursor.execute(q13_query, (g.user['user_id'],))
-        dashboard_data['file_types'] = cursor.fetchall()
+        cursor.execute(q13_query, (g.user.user_id,))
+        dashboard_data['file_types'] = fetch_all(cursor)
 
         q15_query = """
             SELECT p.title AS Collaborative_Project, COUNT(pu.user_id) AS Number_of_Collaborators
@@ -522,8 +697,8 @@ def dashboard():
             WHERE p.project_id IN (SELECT project_id FROM project_user WHERE user_id = %s)
             GROUP BY p.title HAVING COUNT(pu.user_id) > 1 ORDER BY Number_of_Collaborators DESC
         """
-        cursor.execute(q15_query, (g.user['user_id'],))
-        dashboard_data['collaborative_projects'] = cursor.fetchall()
+        cursor.execute(q15_query, (g.user.user_id,))
+        dashboard_data['collaborative_projects'] = fetch_all(cursor)
 
         return render_template('dashboard.html', user=g.user, data=dashboard_data)
 
@@ -546,7 +721,7 @@ def projects_list():
     if conn is None:
         return render_template('projects.html', error="Database connection failed.")
     
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
     
     try:
         query = """
@@ -556,7 +731,7 @@ def projects_list():
             INNER JOIN project_user pu ON p.project_id = pu.project_id
             WHERE pu.user_id = %s
         """
-        params = [g.user['user_id']]
+        params = [g.user.user_id]
         
         if industry_filter:
             query += " AND c.industry = %s"
@@ -573,10 +748,10 @@ def projects_list():
         query += " ORDER BY p.start_date DESC"
         
         cursor.execute(query, tuple(params))
-        projects = cursor.fetchall()
+        projects = fetch_all(cursor)
         
         cursor.execute("SELECT DISTINCT industry FROM client ORDER BY industry")
-        industries = cursor.fetchall()
+        industries = fetch_all(cursor)
         
         return render_template('projects.html', 
                              projects=projects, 
@@ -600,9 +775,9 @@ def project_detail(project_id):
     if conn is None: 
         return render_template('project_detail.html', error="Database connection error."), 500
     
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
 
-    cursor.execute("SELECT project_id FROM project_user WHERE project_id = %s AND user_id = %s", (project_id, g.user['user_id']))
+    cursor.execute("SELECT project_id FROM project_user WHERE project_id = %s AND user_id = %s", (project_id, g.user.user_id))
     if cursor.fetchone() is None:
         abort(403)
 
@@ -615,7 +790,7 @@ def project_detail(project_id):
             GROUP BY p.title, Team_Member
         """
         cursor.execute(q2_query, (project_id,))
-        project_data['team_hours'] = cursor.fetchall()
+        project_data['team_hours'] = fetch_all(cursor)
 
         basic_query = """
             SELECT p.project_id, p.title, p.description, p.total_hours_spent, p.start_date, p.completion_date, p.status,
@@ -624,17 +799,17 @@ def project_detail(project_id):
             WHERE p.project_id = %s
         """
         cursor.execute(basic_query, (project_id,))
-        project_data['summary'] = cursor.fetchone()
+        project_data['summary'] = fetch_one(cursor)
         
         if not project_data['summary']:
             abort(404)
         
         assets_query = """
-            SELECT file_name, file_type, file_size_KB, storage_location, date_uploaded 
+            SELECT asset_id, file_name, file_type, file_size_KB, storage_location, date_uploaded 
             FROM asset WHERE project_id = %s ORDER BY date_uploaded DESC
         """
         cursor.execute(assets_query, (project_id,))
-        project_data['assets'] = cursor.fetchall()
+        project_data['assets'] = fetch_all(cursor)
 
         feedback_query = """
             SELECT CONCAT(u.first_name, ' ', u.last_name) AS Reviewer_Name, f.rating, f.coment, f.date
@@ -642,13 +817,13 @@ def project_detail(project_id):
             WHERE f.project_id = %s ORDER BY f.date DESC
         """
         cursor.execute(feedback_query, (project_id,))
-        project_data['feedback'] = cursor.fetchall()
+        project_data['feedback'] = fetch_all(cursor)
 
         tags_query = """
             SELECT t.tag_name FROM project_tag pt JOIN tag t ON pt.tag_id = t.tag_id WHERE pt.project_id = %s
         """
         cursor.execute(tags_query, (project_id,))
-        project_data['tags'] = cursor.fetchall()
+        project_data['tags'] = fetch_all(cursor)
 
         skills_query = """
             SELECT s.skill_name, ps.skill_proficiency_rating
@@ -656,7 +831,7 @@ def project_detail(project_id):
             WHERE ps.project_id = %s ORDER BY ps.skill_proficiency_rating DESC
         """
         cursor.execute(skills_query, (project_id,))
-        project_data['skills'] = cursor.fetchall()
+        project_data['skills'] = fetch_all(cursor)
 
         team_query = """
             SELECT CONCAT(u.first_name, ' ', u.last_name) AS name, u.role, u.email
@@ -664,7 +839,7 @@ def project_detail(project_id):
             WHERE pu.project_id = %s
         """
         cursor.execute(team_query, (project_id,))
-        project_data['team'] = cursor.fetchall()
+        project_data['team'] = fetch_all(cursor)
 
     except mysql.connector.Error as err:
         print(f"Project Detail Query Error: {err}")
@@ -676,6 +851,53 @@ def project_detail(project_id):
 
     return render_template('project_detail.html', project=project_data)
 
+@app.route('/asset/<int:asset_id>/thumbnail')
+@login_required
+def asset_thumbnail(asset_id):
+    if not THUMBNAIL_TYPES:
+        abort(404)
+
+    conn = get_db_connection()
+    if conn is None:
+        abort(500)
+
+    cursor = conn.cursor()
+
+    try:
+        query = """
+            SELECT a.storage_location, a.file_type
+            FROM asset a INNER JOIN project_user pu ON a.project_id = pu.project_id
+            WHERE a.asset_id = %s AND pu.user_id = %s
+        """
+        cursor.execute(query, (asset_id, g.user.user_id))
+        asset = fetch_one(cursor)
+
+    finally:
+        cursor.close()
+        conn.close()
+
+    if asset is None or asset.file_type not in THUMBNAIL_TYPES:
+        abort(404)
+
+    path = thumbnail_path(asset.storage_location)
+    if not thumbnail_is_fresh(asset.storage_location):
+        # On-demand fallback: render in the worker pool if the background job has not finished
+        try:
+            path = submit_thumbnail(asset.storage_location, asset.file_type).result(timeout=THUMBNAIL_TIMEOUT)
+        except FutureTimeoutError:
+            abort(503)
+        except Exception as err:
+            print(f"Thumbnail Generation Error: {err}")
+            path = None
+        if path is None:
+            abort(404)
+
+    response = send_file(os.path.abspath(path), mimetype='image/jpeg', max_age=24 * 60 * 60)
+    # Previews are behind a membership check, so shared caches must not store them
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
 @app.route('/analytics')
 @login_required
 def analytics():
@@ -685,7 +907,7 @@ def analytics():
     if conn is None:
         return render_template('analytics.html', error="Database connection failed.")
     
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
     
     try:
         q4_query = """
@@ -697,8 +919,8 @@ def analytics():
             INNER JOIN project_user pu ON p.project_id = pu.project_id
             WHERE pu.user_id = %s
         """
-        cursor.execute(q4_query, (g.user['user_id'],))
-        analytics_data['python_data_projects'] = cursor.fetchall()
+        cursor.execute(q4_query, (g.user.user_id,))
+        analytics_data['python_data_projects'] = fetch_all(cursor)
 
         q9_query = """
             SELECT p.project_id, p.title AS Project_Title, p.start_date, p.description
@@ -706,8 +928,8 @@ def analytics():
             INNER JOIN project_user pu ON p.project_id = pu.project_id
             WHERE pu.user_id = %s AND a.asset_id IS NULL
         """
-        cursor.execute(q9_query, (g.user['user_id'],))
-        analytics_data['projects_without_assets'] = cursor.fetchall()
+        cursor.execute(q9_query, (g.user.user_id,))
+        analytics_data['projects_without_assets'] = fetch_all(cursor)
         
         return render_template('analytics.html', data=analytics_data)
     
@@ -720,7 +942,344 @@ def analytics():
         conn.close()
 
 # ==========================================
-# 7. RUN APPLICATION
+# 7. TIME LOG INGESTION
+# ==========================================
+# Entries are made idempotent through a client-supplied entry_id, which needs:
+#   ALTER TABLE time_log ADD COLUMN entry_id VARCHAR(64) NULL, ADD UNIQUE KEY uq_time_log_entry (entry_id);
+
+TIME_LOG_CHUNK_SIZE = 500
+TIME_LOG_CHUNK_RETRIES = 3
+TIME_LOG_HOURS_SCALE = Decimal('0.01')  # Matches the DECIMAL scale of time_log.hours_worked
+
+def parse_time_log_records(stream, fmt):
+    """Yields (line_no, record) pairs from an NDJSON or CSV stream."""
+    if fmt == 'csv':
+        for line_no, record in enumerate(csv.DictReader(stream), start=2):
+            yield line_no, record
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, None
+
+def parse_record_id(value, field):
+    """Accepts an integer or a digit-only string; anything else (1.9, true) is rejected."""
+    if isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+        return int(value.strip())
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise ValueError(f'{field} must be an integer.')
+
+def validate_time_log_record(record):
+    """Turns a raw record into an insert row, raising ValueError if it is invalid."""
+    if not isinstance(record, dict):
+        raise ValueError('Malformed record.')
+
+    entry_id = record.get('entry_id')
+    if not isinstance(entry_id, str) or not entry_id.strip() or len(entry_id.strip()) > 64:
+        raise ValueError('entry_id is required and must be a string (max 64 characters).')
+    entry_id = entry_id.strip()
+
+    project_id = parse_record_id(record.get('project_id'), 'project_id')
+    user_id = parse_record_id(record.get('user_id'), 'user_id')
+
+    try:
+        hours_worked = Decimal(str(record['hours_worked']))
+    except (KeyError, InvalidOperation):
+        raise ValueError('hours_worked must be numeric.')
+    if not hours_worked.is_finite() or hours_worked > 24:
+        raise ValueError('hours_worked must be between 0 and 24.')
+    # Round as MySQL would store it, so values like 0.0001 cannot slip through as 0.00
+    hours_worked = hours_worked.quantize(TIME_LOG_HOURS_SCALE, rounding=ROUND_HALF_UP)
+    if hours_worked <= 0:
+        raise ValueError('hours_worked must be between 0 and 24.')
+
+    # Keep the parsed date for the insert; MySQL rejects some forms fromisoformat accepts
+    try:
+        log_date = date.fromisoformat(record['date']) if record.get('date') else date.today()
+    except (TypeError, ValueError):
+        raise ValueError('date must be in YYYY-MM-DD format.')
+
+    return (entry_id, project_id, user_id, hours_worked, log_date)
+
+def ingest_time_log_chunk(conn, rows, caller_id=None):
+    """Inserts one chunk of validated rows in a single transaction.
+
+    Returns (inserted, duplicates, rejected), where rejected is a list of
+    (entry_id, error) pairs. When caller_id is given, entries are only
+    accepted for projects that user is a member of.
+    """
+    for attempt in range(TIME_LOG_CHUNK_RETRIES):
+        try:
+            return write_time_log_chunk(conn, rows, caller_id)
+        except mysql.connector.Error as err:
+            # A concurrent retry of the same batch can insert our entry_ids first (1062)
+            # or deadlock with us (1213); re-running the chunk then skips them as duplicates
+            if err.errno not in (1062, 1213) or attempt == TIME_LOG_CHUNK_RETRIES - 1:
+                raise
+
+def write_time_log_chunk(conn, rows, caller_id):
+    """Runs one attempt of ingest_time_log_chunk, rolling back on any database error."""
+    cursor = conn.cursor()
+    rejected = []
+
+    try:
+        # Validate project membership for the whole chunk with one query
+        project_ids = sorted({row[1] for row in rows})
+        placeholders = ', '.join(['%s'] * len(project_ids))
+        cursor.execute(f"SELECT project_id, user_id FROM project_user WHERE project_id IN ({placeholders})", tuple(project_ids))
+        members = set(cursor.fetchall())
+
+        candidates = {}
+        for row in rows:
+            entry_id, project_id, user_id = row[0], row[1], row[2]
+            if caller_id is not None and (project_id, caller_id) not in members:
+                rejected.append((entry_id, 'You are not a member of this project.'))
+            elif (project_id, user_id) not in members:
+                rejected.append((entry_id, 'User is not a member of this project.'))
+            else:
+                candidates.setdefault(entry_id, row)
+
+        duplicates = len(rows) - len(rejected) - len(candidates)
+        if not candidates:
+            conn.commit()
+            return 0, duplicates, rejected
+
+        # Skip entries already stored by an earlier (retried) request. This is a plain read:
+        # a locking read would take gap locks on the missing ids and deadlock concurrent retries,
+        # while the unique key on entry_id still rejects a racing duplicate insert.
+        placeholders = ', '.join(['%s'] * len(candidates))
+        cursor.execute(f"SELECT entry_id FROM time_log WHERE entry_id IN ({placeholders})", tuple(candidates))
+        existing = {entry_id for (entry_id,) in cursor.fetchall()}
+        new_rows = [row for entry_id, row in candidates.items() if entry_id not in existing]
+        duplicates += len(existing)
+
+        if new_rows:
+            values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(new_rows))
+            insert_query = f"""
+                INSERT INTO time_log (entry_id, project_id, user_id, hours_worked, date)
+                VALUES {values}
+            """
+            cursor.execute(insert_query, tuple(value for row in new_rows for value in row))
+
+            # Apply the per-project deltas in one statement instead of re-summing time_log
+            placeholders = ', '.join(['%s'] * len(new_rows))
+            delta_query = f"""
+                UPDATE project p INNER JOIN (
+                    SELECT project_id, SUM(hours_worked) AS delta_hours
+                    FROM time_log WHERE entry_id IN ({placeholders})
+                    GROUP BY project_id
+                ) d ON p.project_id = d.project_id
+                SET p.total_hours_spent = COALESCE(p.total_hours_spent, 0) + d.delta_hours
+            """
+            cursor.execute(delta_query, tuple(row[0] for row in new_rows))
+
+        conn.commit()
+        return len(new_rows), duplicates, rejected
+
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+
+def ingest_time_logs(conn, stream, fmt, caller_id=None):
+    """Validates and stores time entries from stream in chunked transactions."""
+    summary = {'inserted': 0, 'duplicates': 0, 'rejected': []}
+    chunk = []
+
+    def flush():
+        inserted, duplicates, rejected = ingest_time_log_chunk(conn, chunk, caller_id)
+        summary['inserted'] += inserted
+        summary['duplicates'] += duplicates
+        summary['rejected'].extend({'entry_id': entry_id, 'error': error} for entry_id, error in rejected)
+        chunk.clear()
+
+    try:
+        for line_no, record in parse_time_log_records(stream, fmt):
+            try:
+                chunk.append(validate_time_log_record(record))
+            except ValueError as err:
+                summary['rejected'].append({'line': line_no, 'error': str(err)})
+                continue
+            if len(chunk) >= TIME_LOG_CHUNK_SIZE:
+                flush()
+        if chunk:
+            flush()
+    except (mysql.connector.Error, csv.Error, UnicodeDecodeError) as err:
+        # Committed chunks stay in place; retrying the batch skips them by entry_id
+        print(f"Time Log Ingestion Error: {err}")
+        summary['error'] = 'Ingestion stopped early; retry the batch to resume.'
+
+    return summary
+
+@app.route('/time_logs/bulk', methods=['POST'])
+@login_required
+def bulk_time_logs():
+    """Accepts NDJSON (default) or CSV time entries for the user's projects."""
+    fmt = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify(error="Database connection failed."), 503
+
+    try:
+        # Spreadsheet exports often start with a byte-order mark
+        stream = io.StringIO(request.get_data(as_text=True).lstrip('\ufeff'), newline='')
+        summary = ingest_time_logs(conn, stream, fmt, caller_id=g.user.user_id)
+    finally:
+        conn.close()
+
+    return jsonify(summary), 500 if 'error' in summary else 200
+
+@app.cli.command('ingest-time-logs')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default=None,
+              help='Input format (defaults to the file extension).')
+def ingest_time_logs_command(path, fmt):
+    """Bulk-loads time entries from an NDJSON or CSV file."""
+    if fmt is None:
+        fmt = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+    conn = get_db_connection()
+    if conn is None:
+        raise click.ClickException("Database connection failed.")
+
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            summary = ingest_time_logs(conn, stream, fmt)
+    finally:
+        conn.close()
+
+    click.echo(f"Inserted {summary['inserted']}, skipped {summary['duplicates']} duplicates, rejected {len(summary['rejected'])}.")
+    for item in summary['rejected']:
+        where = f"line {item['line']}" if 'line' in item else f"entry {item['entry_id']}"
+        click.echo(f"  {where}: {item['error']}")
+    if 'error' in summary:
+        raise click.ClickException(summary['error'])
+
+# ==========================================
+# 8. STATIC ASSET PIPELINE
+# ==========================================
+
+def minify_css(source):
+    """Strips comments and redundant whitespace from a stylesheet."""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    return source.replace(';}', '}').strip()
+
+def minify_js(source):
+    """Drops full-line comments, indentation and blank lines from a script."""
+    lines = (line.strip() for line in source.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+@functools.lru_cache(maxsize=1)
+def read_asset_manifest(mtime):
+    """Loads the manifest; cached per modification time so rebuilds are picked up."""
+    with open(ASSET_MANIFEST, encoding='utf-8') as f:
+        return json.load(f)
+
+@app.template_global()
+def asset_url(filename):
+    """Like url_for('static', ...) but resolves to the fingerprinted bundle when built."""
+    try:
+        manifest = read_asset_manifest(os.path.getmtime(ASSET_MANIFEST))
+    except OSError:
+        manifest = {}
+
+    if filename in manifest:
+        return url_for('dist_asset', filename=manifest[filename])
+    return url_for('static', filename=filename)
+
+@app.route('/static/dist/<path:filename>')
+def dist_asset(filename):
+    """Serves a fingerprinted bundle, pre-compressed when the client accepts it."""
+    # Only hashed bundles are immutable; the manifest and the raw .gz/.br files are not served.
+    # Bundles from earlier builds stay servable for pages still referencing them.
+    if not FINGERPRINTED_ASSET.match(filename):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(ASSET_DIST_FOLDER, filename + suffix)):
+            response = send_from_directory(ASSET_DIST_FOLDER, filename + suffix, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIST_FOLDER, filename, max_age=ASSET_MAX_AGE)
+
+    # Names change whenever the content does, so browsers never need to revalidate
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.cli.command('build-assets')
+@click.option('--prune', is_flag=True,
+              help='Delete bundles from earlier builds (only once no cached page references them).')
+def build_assets_command(prune):
+    """Minifies, fingerprints and pre-compresses the CSS/JS under static/."""
+    os.makedirs(ASSET_DIST_FOLDER, exist_ok=True)
+    manifest = {}
+
+    for subdir in ASSET_SOURCE_DIRS:
+        source_dir = os.path.join(app.static_folder, subdir)
+        if not os.path.isdir(source_dir):
+            continue
+        os.makedirs(os.path.join(ASSET_DIST_FOLDER, subdir), exist_ok=True)
+
+        for name in sorted(os.listdir(source_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext not in ('.css', '.js'):
+                continue
+            with open(os.path.join(source_dir, name), encoding='utf-8') as f:
+                source = f.read()
+
+            content = (minify_css(source) if ext == '.css' else minify_js(source)).encode('utf-8')
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            hashed_name = f"{subdir}/{stem}.{digest}{ext}"
+            output_path = os.path.join(ASSET_DIST_FOLDER, hashed_name)
+
+            with open(output_path, 'wb') as f:
+                f.write(content)
+            with open(output_path + '.gz', 'wb') as f:
+                f.write(gzip.compress(content, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(output_path + '.br', 'wb') as f:
+                    f.write(brotli.compress(content))
+
+            manifest[f"{subdir}/{name}"] = hashed_name
+            click.echo(f"{subdir}/{name} -> {hashed_name} ({len(source)} -> {len(content)} bytes)")
+
+    # Replace the manifest atomically so running workers never read a partial file
+    temp_manifest = ASSET_MANIFEST + '.tmp'
+    with open(temp_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_manifest, ASSET_MANIFEST)
+
+    if prune:
+        current = set(manifest.values())
+        for subdir in ASSET_SOURCE_DIRS:
+            dist_dir = os.path.join(ASSET_DIST_FOLDER, subdir)
+            if not os.path.isdir(dist_dir):
+                continue
+            for name in os.listdir(dist_dir):
+                bundle = f"{subdir}/{name.removesuffix('.gz').removesuffix('.br')}"
+                if bundle not in current:
+                    os.remove(os.path.join(dist_dir, name))
+                    click.echo(f"Pruned {subdir}/{name}")
+
+    if brotli is None:
+        click.echo("brotli is not installed; only gzip variants were written.")
+
+# ==========================================
+# 9. RUN APPLICATION
 # ==========================================
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file